@@ -4,5 +4,6 @@ from py_miraie_ac.device import Device
 from py_miraie_ac.deviceStatus import DeviceStatus
 from py_miraie_ac.exceptions import AuthException, ConnectionException, MobileNotRegisteredException
 from py_miraie_ac.home import Home
+from py_miraie_ac.scheduler import ScheduleRule, Scheduler
 from py_miraie_ac.user import User
 from py_miraie_ac.enums import AuthType,DisplayState,FanMode,HVACMode,PowerMode,PresetMode,SwingMode
@@ -39,6 +39,11 @@ class MirAIeAPI:
         """Returns a list of available devices."""
         return list(self._home.devices.values())
 
+    @property
+    def home(self) -> Home:
+        """Returns the home."""
+        return self._home
+
     def __init__(self, auth_type: AuthType, login_id: str, password: str):
         self._auth_type = str(auth_type.value)
         self._login_id = login_id
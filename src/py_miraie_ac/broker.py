@@ -4,7 +4,7 @@ import json
 import math
 import random
 import ssl
-from typing import Callable
+from typing import Callable, Optional
 from paho.mqtt import client as paho
 from .enums import FanMode, HVACMode, PowerMode, PresetMode, SwingMode
 
@@ -102,6 +102,21 @@ class MirAIeBroker:
         message = self._build_horizontal_swing_mode_message(value)
         self._client.publish(topic, message)
 
+    def set_state(
+        self,
+        topic: str,
+        power_mode: Optional[PowerMode] = None,
+        temperature: Optional[float] = None,
+        hvac_mode: Optional[HVACMode] = None,
+        fan_mode: Optional[FanMode] = None,
+        preset_mode: Optional[PresetMode] = None,
+    ):
+        """Sets several values in a single control message"""
+        message = self._build_state_message(
+            power_mode, temperature, hvac_mode, fan_mode, preset_mode
+        )
+        self._client.publish(topic, message)
+
     def _generate_client_id(self):
         return (
             f"an{self._generate_random_number(16)}{self._generate_random_number(5)}"
@@ -161,7 +176,10 @@ class MirAIeBroker:
 
     def _build_preset_mode_message(self, mode: PresetMode):
         message = self._build_base_message()
+        self._apply_preset_mode(message, mode)
+        return json.dumps(message)
 
+    def _apply_preset_mode(self, message: dict, mode: PresetMode):
         if mode == PresetMode.NONE:
             message["acem"] = "off"
             message["acpm"] = "off"
@@ -172,6 +190,27 @@ class MirAIeBroker:
         elif mode == PresetMode.BOOST:
             message["acem"] = "off"
             message["acpm"] = "on"
+
+    def _build_state_message(
+        self,
+        power_mode: Optional[PowerMode],
+        temperature: Optional[float],
+        hvac_mode: Optional[HVACMode],
+        fan_mode: Optional[FanMode],
+        preset_mode: Optional[PresetMode],
+    ):
+        message = self._build_base_message()
+
+        if power_mode is not None:
+            message["ps"] = str(power_mode.value)
+        if hvac_mode is not None:
+            message["acmd"] = str(hvac_mode.value)
+        if fan_mode is not None:
+            message["acfs"] = str(fan_mode.value)
+        if preset_mode is not None:
+            self._apply_preset_mode(message, preset_mode)
+        if temperature is not None:
+            message["actmp"] = str(temperature)
         return json.dumps(message)
 
     def _build_vertical_swing_mode_message(self, mode: SwingMode):
@@ -1,6 +1,6 @@
 """The MirAIe device"""
 from __future__ import annotations
-from typing import Callable
+from typing import Callable, Optional
 from .broker import MirAIeBroker
 from .deviceStatus import DeviceStatus
 from .enums import DisplayState, FanMode, HVACMode, PowerMode, PresetMode, SwingMode
@@ -129,6 +129,24 @@ class Device:
         """Sets the swing mode"""
         self._broker.set_horizontal_swing_mode(self.control_topic, mode)
 
+    def set_state(
+        self,
+        power_mode: Optional[PowerMode] = None,
+        temperature: Optional[float] = None,
+        hvac_mode: Optional[HVACMode] = None,
+        fan_mode: Optional[FanMode] = None,
+        preset_mode: Optional[PresetMode] = None,
+    ):
+        """Sets several values with a single control message"""
+        self._broker.set_state(
+            self.control_topic,
+            power_mode=power_mode,
+            temperature=temperature,
+            hvac_mode=hvac_mode,
+            fan_mode=fan_mode,
+            preset_mode=preset_mode,
+        )
+
     def register_callback(self, callback: Callable[[], None]) -> None:
         """Registers a callback function"""
         self._callbacks.append(callback)
@@ -1,16 +1,185 @@
 """Represents a home"""
+from __future__ import annotations
+import bisect
+import threading
+from typing import Any, Optional
 from .device import Device
+from .enums import HVACMode, PowerMode
+
+_STATIC_INDEXES = {
+    "name": lambda d: d.name,
+    "area_name": lambda d: d.area_name,
+    "model_name": lambda d: d.model_name,
+}
+
+# to_float returns this when the temperature is missing or invalid
+_UNKNOWN_TEMPERATURE = -1.0
+
+_STATUS_INDEXES = {
+    "power_mode": lambda d: d.status.power_mode,
+    "hvac_mode": lambda d: d.status.hvac_mode,
+    "is_online": lambda d: d.status.is_online,
+}
 
 class Home:
     """The Home class"""
     home_id: str
     devices: dict[str, Device]
+    _indexes: dict[str, dict[Any, dict[str, Device]]]
+    _indexed_status: dict[str, dict[str, Any]]
+    _temperature_keys: list[float]
+    _temperature_ids: list[str]
+    _lock: threading.Lock
 
     def __init__(self, home_id: str, devices: list[Device]):
         self.home_id = home_id
         self.devices = dict((d.device_id, d) for d in devices)
+        self._indexes = dict((field, {}) for field in {**_STATIC_INDEXES, **_STATUS_INDEXES})
+        self._indexed_status = {}
+        self._temperature_keys = []
+        self._temperature_ids = []
+        self._lock = threading.Lock()
+
+        for device in self.devices.values():
+            for field, key in _STATIC_INDEXES.items():
+                self._add_to_index(field, key(device), device)
+            self._indexed_status[device.device_id] = {}
+            self._reindex_status(device)
+            device.register_callback(self._build_reindex_callback(device))
 
     def get_device(self, device_id: str):
         """Gets a device by its ID"""
         if device_id in self.devices:
             return self.devices[device_id]
+
+    def get_devices_by_name(self, name: str) -> list[Device]:
+        """Gets the devices matching a name or friendly name"""
+        return self._lookup("name", str(name).lower().replace(" ", "-"))
+
+    def get_devices_by_area(self, area_name: str) -> list[Device]:
+        """Gets the devices in an area"""
+        return self._lookup("area_name", area_name)
+
+    def get_devices_by_model(self, model_name: str) -> list[Device]:
+        """Gets the devices of a model"""
+        return self._lookup("model_name", model_name)
+
+    def get_devices_by_power_mode(self, mode: PowerMode) -> list[Device]:
+        """Gets the devices in a power mode"""
+        return self._lookup("power_mode", mode)
+
+    def get_devices_by_hvac_mode(self, mode: HVACMode) -> list[Device]:
+        """Gets the devices in an HVAC mode"""
+        return self._lookup("hvac_mode", mode)
+
+    def get_online_devices(self) -> list[Device]:
+        """Gets the devices that are online"""
+        return self._lookup("is_online", True)
+
+    def get_devices_by_temperature(
+        self,
+        min_temperature: Optional[float] = None,
+        max_temperature: Optional[float] = None,
+    ) -> list[Device]:
+        """Gets the devices with a set temperature within the given bounds, inclusive"""
+        with self._lock:
+            return list(self._temperature_range(min_temperature, max_temperature).values())
+
+    def find_devices(
+        self,
+        name: Optional[str] = None,
+        area_name: Optional[str] = None,
+        model_name: Optional[str] = None,
+        power_mode: Optional[PowerMode] = None,
+        hvac_mode: Optional[HVACMode] = None,
+        is_online: Optional[bool] = None,
+        min_temperature: Optional[float] = None,
+        max_temperature: Optional[float] = None,
+    ) -> list[Device]:
+        """Gets the devices matching all of the given fields"""
+        criteria = {
+            "name": str(name).lower().replace(" ", "-") if name is not None else None,
+            "area_name": area_name,
+            "model_name": model_name,
+            "power_mode": power_mode,
+            "hvac_mode": hvac_mode,
+            "is_online": is_online,
+        }
+        with self._lock:
+            buckets = [
+                self._indexes[field].get(value, {})
+                for field, value in criteria.items()
+                if value is not None
+            ]
+            if min_temperature is not None or max_temperature is not None:
+                buckets.append(self._temperature_range(min_temperature, max_temperature))
+
+            if not buckets:
+                return list(self.devices.values())
+
+            buckets.sort(key=len)
+            return [
+                device
+                for device_id, device in list(buckets[0].items())
+                if all(device_id in bucket for bucket in buckets[1:])
+            ]
+
+    def _lookup(self, field: str, value) -> list[Device]:
+        with self._lock:
+            return list(self._indexes[field].get(value, {}).values())
+
+    def _temperature_range(
+        self, min_temperature: Optional[float], max_temperature: Optional[float]
+    ) -> dict[str, Device]:
+        start = 0
+        end = len(self._temperature_keys)
+        if min_temperature is not None:
+            start = bisect.bisect_left(self._temperature_keys, min_temperature)
+        if max_temperature is not None:
+            end = bisect.bisect_right(self._temperature_keys, max_temperature)
+        return dict(
+            (device_id, self.devices[device_id])
+            for device_id in self._temperature_ids[start:end]
+        )
+
+    def _build_reindex_callback(self, device: Device):
+        def callback():
+            self._reindex_status(device)
+
+        return callback
+
+    def _reindex_status(self, device: Device):
+        with self._lock:
+            indexed = self._indexed_status[device.device_id]
+            for field, key in _STATUS_INDEXES.items():
+                value = key(device)
+                if field in indexed:
+                    if indexed[field] == value:
+                        continue
+                    self._remove_from_index(field, indexed[field], device)
+                self._add_to_index(field, value, device)
+                indexed[field] = value
+
+            temperature = device.status.temperature
+            if indexed.get("temperature") != temperature:
+                if indexed.get("temperature", _UNKNOWN_TEMPERATURE) != _UNKNOWN_TEMPERATURE:
+                    start = bisect.bisect_left(self._temperature_keys, indexed["temperature"])
+                    position = self._temperature_ids.index(device.device_id, start)
+                    del self._temperature_keys[position]
+                    del self._temperature_ids[position]
+                if temperature != _UNKNOWN_TEMPERATURE:
+                    position = bisect.bisect_right(self._temperature_keys, temperature)
+                    self._temperature_keys.insert(position, temperature)
+                    self._temperature_ids.insert(position, device.device_id)
+                indexed["temperature"] = temperature
+
+    def _add_to_index(self, field: str, value, device: Device):
+        self._indexes[field].setdefault(value, {})[device.device_id] = device
+
+    def _remove_from_index(self, field: str, value, device: Device):
+        bucket = self._indexes[field].get(value)
+        if bucket is None:
+            return
+        bucket.pop(device.device_id, None)
+        if not bucket:
+            del self._indexes[field][value]
@@ -0,0 +1,300 @@
+"""The schedule and automation engine"""
+from __future__ import annotations
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from datetime import time as time_of_day
+from typing import Iterable, Optional
+from .device import Device
+from .enums import FanMode, HVACMode, PowerMode, PresetMode
+from .home import Home
+
+_LOGGER = logging.getLogger(__name__)
+
+_ACTION_TYPES = {
+    "power_mode": PowerMode,
+    "temperature": float,
+    "hvac_mode": HVACMode,
+    "fan_mode": FanMode,
+    "preset_mode": PresetMode,
+}
+
+ALL_WEEKDAYS = (0, 1, 2, 3, 4, 5, 6)
+
+class ScheduleRule:
+    """The Schedule Rule class"""
+
+    rule_id: str
+    at: time_of_day
+    weekdays: tuple[int, ...]
+    device_id: Optional[str]
+    area_name: Optional[str]
+    actions: dict
+
+    def __init__(
+        self,
+        rule_id: str,
+        at: time_of_day,
+        actions: dict,
+        device_id: Optional[str] = None,
+        area_name: Optional[str] = None,
+        weekdays: Iterable[int] = ALL_WEEKDAYS,
+    ):
+        if (device_id is None) == (area_name is None):
+            raise ValueError("A rule must target either a device_id or an area_name")
+        if at.tzinfo is not None:
+            raise ValueError("at must be a naive local time")
+        if not actions:
+            raise ValueError("A rule must have at least one action")
+        unknown = set(actions) - set(_ACTION_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown schedule actions: {sorted(unknown)}")
+
+        self.rule_id = rule_id
+        self.at = at
+        self.weekdays = tuple(sorted(set(weekdays)))
+        self.device_id = device_id
+        self.area_name = area_name
+        self.actions = dict(
+            (key, _ACTION_TYPES[key](value)) for key, value in actions.items()
+        )
+
+        if not self.weekdays or not set(self.weekdays) <= set(ALL_WEEKDAYS):
+            raise ValueError("weekdays must contain values between 0 (Monday) and 6 (Sunday)")
+
+    def next_run(self, after: datetime) -> datetime:
+        """Gets the first time this rule fires strictly after the given time
+
+        Times are compared as timestamps so that ``fold`` is respected. A time
+        repeated when clocks go back fires on its first occurrence only, and
+        a time skipped when clocks go forward fires an hour later.
+        """
+        after_ts = after.timestamp()
+        start = datetime.fromtimestamp(after_ts).date()
+        for offset in range(8):
+            day = start + timedelta(days=offset)
+            if day.weekday() not in self.weekdays:
+                continue
+            candidate_ts = datetime.combine(day, self.at).timestamp()
+            if candidate_ts > after_ts:
+                return datetime.fromtimestamp(candidate_ts).astimezone()
+        raise ValueError("Unable to find the next run time")
+
+    def to_dict(self) -> dict:
+        """Converts the rule to a JSON serializable dict"""
+        return {
+            "rule_id": self.rule_id,
+            "at": self.at.strftime("%H:%M:%S"),
+            "weekdays": list(self.weekdays),
+            "device_id": self.device_id,
+            "area_name": self.area_name,
+            "actions": dict(
+                (key, value.value if key != "temperature" else value)
+                for key, value in self.actions.items()
+            ),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ScheduleRule:
+        """Creates a rule from a dict produced by to_dict"""
+        return cls(
+            rule_id=data["rule_id"],
+            at=time_of_day.fromisoformat(data["at"]),
+            actions=data["actions"],
+            device_id=data.get("device_id"),
+            area_name=data.get("area_name"),
+            weekdays=data.get("weekdays", ALL_WEEKDAYS),
+        )
+
+
+class Scheduler:
+    """The Scheduler class, running all rules from a single timer heap"""
+
+    _home: Home
+    _rules: dict[str, ScheduleRule]
+    _order: dict[str, int]
+    _heap: list[tuple[float, int, int, ScheduleRule]]
+    _task: Optional[asyncio.Task]
+    _wakeup: Optional[asyncio.Event]
+
+    def __init__(self, home: Home):
+        self._home = home
+        self._rules = {}
+        self._order = {}
+        self._heap = []
+        self._dead = 0
+        self._counter = itertools.count()
+        self._task = None
+        self._wakeup = None
+
+    @property
+    def rules(self) -> list[ScheduleRule]:
+        """Returns a list of the scheduled rules."""
+        return list(self._rules.values())
+
+    def add_rule(self, rule: ScheduleRule):
+        """Adds a rule, replacing any existing rule with the same ID"""
+        if rule.rule_id in self._rules:
+            self._dead += 1
+        self._rules[rule.rule_id] = rule
+        self._order[rule.rule_id] = next(self._counter)
+        self._push(rule, rule.next_run(datetime.now().astimezone()))
+
+        if self._wakeup is not None and self._heap[0][3] is rule:
+            self._wakeup.set()
+        self._compact()
+
+    def remove_rule(self, rule_id: str):
+        """Removes a rule"""
+        if self._rules.pop(rule_id, None) is not None:
+            self._order.pop(rule_id, None)
+            self._dead += 1
+            self._compact()
+
+    def load_rules(self, rules: Iterable[ScheduleRule]):
+        """Replaces all rules with the given rules"""
+        now = datetime.now().astimezone()
+        new_rules: dict[str, ScheduleRule] = {}
+        new_order: dict[str, int] = {}
+        new_heap: list[tuple[float, int, int, ScheduleRule]] = []
+
+        for rule in rules:
+            new_rules[rule.rule_id] = rule
+            new_order[rule.rule_id] = next(self._counter)
+        for rule in new_rules.values():
+            new_heap.append(
+                (rule.next_run(now).timestamp(), next(self._counter), new_order[rule.rule_id], rule)
+            )
+        heapq.heapify(new_heap)
+
+        self._rules = new_rules
+        self._order = new_order
+        self._heap = new_heap
+        self._dead = 0
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def save(self, path: str):
+        """Saves the rules to a JSON file, replacing it atomically"""
+        data = {"rules": [rule.to_dict() for rule in self._rules.values()]}
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)), prefix=".rules-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def load(self, path: str):
+        """Loads the rules from a JSON file"""
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        rules = [ScheduleRule.from_dict(rule) for rule in data["rules"]]
+        self.load_rules(rules)
+
+    def start(self):
+        """Starts running the scheduled rules"""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stops running the scheduled rules"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._wakeup = None
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            self._discard_removed()
+            delay = self._heap[0][0] - time.time() if self._heap else None
+
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                self._run_due(time.time())
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running scheduled rules")
+            await asyncio.sleep(0)
+
+    def _run_due(self, now: float):
+        due: list[ScheduleRule] = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, generation, rule = heapq.heappop(self._heap)
+            if self._order.get(rule.rule_id) == generation:
+                due.append(rule)
+            else:
+                self._dead -= 1
+
+        after = datetime.fromtimestamp(now).astimezone()
+        for rule in due:
+            when = rule.next_run(after)
+            if when.timestamp() > now:
+                self._push(rule, when)
+            else:
+                _LOGGER.error("Removing rule %s, next run %s is not in the future", rule.rule_id, when)
+                self._rules.pop(rule.rule_id, None)
+                self._order.pop(rule.rule_id, None)
+
+        due.sort(key=lambda r: self._order.get(r.rule_id, -1))
+        states: dict[str, tuple[Device, dict]] = {}
+        for rule in due:
+            for device in self._get_targets(rule):
+                states.setdefault(device.device_id, (device, {}))[1].update(rule.actions)
+
+        for device, actions in states.values():
+            try:
+                device.set_state(**actions)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error applying scheduled state to %s", device.device_id)
+
+    def _get_targets(self, rule: ScheduleRule) -> list[Device]:
+        if rule.device_id is not None:
+            device = self._home.get_device(rule.device_id)
+            return [device] if device is not None else []
+        return self._home.get_devices_by_area(rule.area_name)
+
+    def _push(self, rule: ScheduleRule, when: datetime):
+        heapq.heappush(
+            self._heap,
+            (when.timestamp(), next(self._counter), self._order[rule.rule_id], rule),
+        )
+
+    def _discard_removed(self):
+        while self._heap and self._order.get(self._heap[0][3].rule_id) != self._heap[0][2]:
+            heapq.heappop(self._heap)
+            self._dead -= 1
+
+    def _compact(self):
+        if self._dead <= len(self._rules):
+            return
+        self._heap = [
+            entry for entry in self._heap
+            if self._order.get(entry[3].rule_id) == entry[2]
+        ]
+        heapq.heapify(self._heap)
+        self._dead = 0
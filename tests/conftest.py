@@ -0,0 +1,69 @@
+"""Shared test fixtures"""
+import pytest
+from py_miraie_ac.device import Device
+from py_miraie_ac.deviceStatus import DeviceStatus
+from py_miraie_ac.enums import DisplayState, FanMode, HVACMode, PowerMode, PresetMode, SwingMode
+
+
+class FakeBroker:
+    """Records control messages instead of publishing them"""
+
+    def __init__(self):
+        self.published = []
+
+    def register_callback(self, topic, callback):
+        pass
+
+    def set_state(self, topic, **values):
+        self.published.append(
+            (topic, dict((key, value) for key, value in values.items() if value is not None))
+        )
+
+
+def build_status(
+    is_online=True, power_mode=PowerMode.OFF, hvac_mode=HVACMode.COOL, temperature=24.0
+):
+    return DeviceStatus(
+        is_online=is_online,
+        temperature=temperature,
+        room_temp=28.0,
+        power_mode=power_mode,
+        fan_mode=FanMode.AUTO,
+        display_state=DisplayState.ON,
+        hvac_mode=hvac_mode,
+        preset_mode=PresetMode.NONE,
+        horizontal_swing_mode=SwingMode.AUTO,
+        vertical_swing_mode=SwingMode.AUTO,
+    )
+
+
+@pytest.fixture
+def broker():
+    return FakeBroker()
+
+
+@pytest.fixture
+def make_device(broker):
+    def make(device_id, friendly_name=None, area_name="Hall", model_name="CS-1", **status):
+        friendly_name = friendly_name or f"AC {device_id}"
+        return Device(
+            device_id=device_id,
+            name=friendly_name.lower().replace(" ", "-"),
+            friendly_name=friendly_name,
+            control_topic=f"{device_id}/control",
+            status_topic=f"{device_id}/status",
+            connection_status_topic=f"{device_id}/connectionStatus",
+            model_name=model_name,
+            mac_address="",
+            category="AC",
+            brand="Panasonic",
+            firmware_version="",
+            serial_number="",
+            model_number="",
+            product_serial_number="",
+            status=build_status(**status),
+            broker=broker,
+            area_name=area_name,
+        )
+
+    return make
@@ -0,0 +1,96 @@
+"""Tests for the Home device indexes"""
+import threading
+from py_miraie_ac.enums import HVACMode, PowerMode
+from py_miraie_ac.home import Home
+
+
+def status_message(ps="on", acmd="cool", actmp="24", online="true"):
+    return {
+        "actmp": actmp,
+        "rmtmp": "28",
+        "ps": ps,
+        "acfs": "auto",
+        "acdc": "on",
+        "acmd": acmd,
+        "acpm": "off",
+        "acem": "off",
+        "acvs": 0,
+        "achs": 0,
+        "onlineStatus": online,
+    }
+
+
+def ids(devices):
+    return [d.device_id for d in devices]
+
+
+def test_static_indexes(make_device):
+    home = Home("h", [
+        make_device("1", "Living Room", area_name="Hall"),
+        make_device("2", "Bedroom", area_name="Upstairs", model_name="CS-2"),
+    ])
+
+    assert ids(home.get_devices_by_name("Living Room")) == ["1"]
+    assert ids(home.get_devices_by_name("living-room")) == ["1"]
+    assert ids(home.get_devices_by_area("Upstairs")) == ["2"]
+    assert ids(home.get_devices_by_model("CS-2")) == ["2"]
+    assert ids(home.find_devices(name="Bedroom", area_name="Hall")) == []
+
+
+def test_status_indexes_follow_updates(make_device):
+    devices = [make_device("1"), make_device("2", is_online=False)]
+    home = Home("h", devices)
+
+    assert ids(home.get_online_devices()) == ["1"]
+    assert ids(home.get_devices_by_power_mode(PowerMode.OFF)) == ["1", "2"]
+
+    devices[1].status_callback_handler(status_message(ps="on", acmd="dry"))
+    assert ids(home.get_online_devices()) == ["1", "2"]
+    assert ids(home.get_devices_by_power_mode(PowerMode.ON)) == ["2"]
+    assert ids(home.get_devices_by_hvac_mode(HVACMode.DRY)) == ["2"]
+
+    devices[0].connection_callback_handler({"onlineStatus": "false"})
+    assert ids(home.get_online_devices()) == ["2"]
+
+
+def test_temperature_range(make_device):
+    devices = [
+        make_device("1", temperature=22.0),
+        make_device("2", temperature=26.0),
+        make_device("3", temperature=28.0),
+    ]
+    home = Home("h", devices)
+
+    assert ids(home.get_devices_by_temperature(min_temperature=26.0)) == ["2", "3"]
+    assert ids(home.get_devices_by_temperature(max_temperature=26.0)) == ["1", "2"]
+
+    devices[0].status_callback_handler(status_message(actmp="27"))
+    assert ids(home.find_devices(hvac_mode=HVACMode.COOL, min_temperature=26.5)) == ["1", "3"]
+
+    devices[1].status_callback_handler(status_message(actmp=None))
+    assert ids(home.get_devices_by_temperature(max_temperature=27.0)) == ["1"]
+    assert ids(home.find_devices(max_temperature=30.0)) == ["1", "3"]
+
+    devices[1].status_callback_handler(status_message(actmp="20"))
+    assert ids(home.get_devices_by_temperature(max_temperature=27.0)) == ["2", "1"]
+
+
+def test_queries_during_concurrent_updates(make_device):
+    devices = [make_device(str(i)) for i in range(50)]
+    home = Home("h", devices)
+    stop = threading.Event()
+
+    def update():
+        while not stop.is_set():
+            for device in devices:
+                device.status_callback_handler(status_message(ps="on"))
+                device.status_callback_handler(status_message(ps="off"))
+
+    worker = threading.Thread(target=update)
+    worker.start()
+    try:
+        for _ in range(2000):
+            home.find_devices(power_mode=PowerMode.ON, is_online=True)
+    finally:
+        stop.set()
+        worker.join()
@@ -0,0 +1,219 @@
+"""Tests for the schedule engine"""
+import asyncio
+import logging
+import json
+import time
+from datetime import datetime
+from datetime import time as time_of_day
+import pytest
+from py_miraie_ac.enums import HVACMode, PowerMode
+from py_miraie_ac.home import Home
+from py_miraie_ac.scheduler import ScheduleRule, Scheduler
+
+
+@pytest.fixture
+def new_york(monkeypatch):
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def local(*args, fold=0):
+    return datetime(*args, fold=fold)
+
+
+def due_all(scheduler):
+    """Runs every rule currently on the heap as one batch"""
+    scheduler._run_due(max(entry[0] for entry in scheduler._heap))
+
+
+def test_next_run_same_day_and_weekday_wrap():
+    # 2026-10-16 is a Friday
+    rule = ScheduleRule("r", time_of_day(9), {"power_mode": PowerMode.ON}, device_id="1",
+                        weekdays=(0,))
+
+    assert rule.next_run(local(2026, 10, 12, 8, 0)).replace(tzinfo=None) == local(2026, 10, 12, 9)
+    assert rule.next_run(local(2026, 10, 12, 9, 0)).replace(tzinfo=None) == local(2026, 10, 19, 9)
+    assert rule.next_run(local(2026, 10, 16, 23, 0)).replace(tzinfo=None) == local(2026, 10, 19, 9)
+
+
+def test_next_run_repeated_hour(new_york):
+    rule = ScheduleRule("r", time_of_day(1, 30), {"power_mode": PowerMode.ON}, device_id="1")
+
+    first_pass = rule.next_run(local(2026, 11, 1, 1, 20))
+    assert first_pass.timestamp() == local(2026, 11, 1, 1, 30).timestamp()
+
+    after = local(2026, 11, 1, 1, 20, fold=1)
+    second_pass = rule.next_run(after)
+    assert second_pass.timestamp() > after.timestamp()
+    assert second_pass.timestamp() == local(2026, 11, 2, 1, 30).timestamp()
+
+
+def test_next_run_skipped_hour(new_york):
+    rule = ScheduleRule("r", time_of_day(2, 30), {"power_mode": PowerMode.ON}, device_id="1")
+    after = local(2026, 3, 8, 1, 0)
+
+    when = rule.next_run(after)
+    assert when.timestamp() > after.timestamp()
+    assert when.replace(tzinfo=None) == local(2026, 3, 8, 3, 30)
+
+
+def test_rule_validation():
+    with pytest.raises(ValueError):
+        ScheduleRule("r", time_of_day(9), {"power_mode": "sideways"}, device_id="1")
+    with pytest.raises(ValueError):
+        ScheduleRule("r", time_of_day(9), {}, device_id="1")
+    with pytest.raises(ValueError):
+        ScheduleRule("r", time_of_day(9), {"fan": "auto"}, device_id="1")
+    with pytest.raises(ValueError):
+        ScheduleRule("r", time_of_day(9), {"temperature": 24}, device_id="1", area_name="Hall")
+    with pytest.raises(ValueError):
+        ScheduleRule("r", time_of_day(9, tzinfo=datetime.now().astimezone().tzinfo),
+                     {"temperature": 24}, device_id="1")
+
+    rule = ScheduleRule("r", time_of_day(9), {"power_mode": "on", "temperature": "24"}, device_id="1")
+    assert rule.actions == {"power_mode": PowerMode.ON, "temperature": 24.0}
+
+
+def test_same_instant_rules_merge_per_device(make_device, broker):
+    home = Home("h", [make_device("1"), make_device("2"), make_device("3", area_name="Bed")])
+    scheduler = Scheduler(home)
+    scheduler.add_rule(ScheduleRule("area", time_of_day(9), {
+        "power_mode": PowerMode.ON, "temperature": 24.0
+    }, area_name="Hall"))
+    scheduler.add_rule(ScheduleRule("one", time_of_day(9), {
+        "temperature": 26.0, "hvac_mode": HVACMode.DRY
+    }, device_id="2"))
+
+    due_all(scheduler)
+
+    assert broker.published == [
+        ("1/control", {"power_mode": PowerMode.ON, "temperature": 24.0}),
+        ("2/control", {"power_mode": PowerMode.ON, "temperature": 26.0, "hvac_mode": HVACMode.DRY}),
+    ]
+    assert len(scheduler._heap) == 2
+
+
+def test_removed_and_replaced_rules_are_discarded(make_device, broker):
+    home = Home("h", [make_device("1"), make_device("2")])
+    scheduler = Scheduler(home)
+    scheduler.add_rule(ScheduleRule("a", time_of_day(9), {"temperature": 20.0}, device_id="1"))
+    scheduler.add_rule(ScheduleRule("b", time_of_day(9), {"temperature": 21.0}, device_id="2"))
+    scheduler.add_rule(ScheduleRule("c", time_of_day(9, 0, 1), {"power_mode": PowerMode.ON}, device_id="1"))
+    scheduler.add_rule(ScheduleRule("b", time_of_day(9), {"temperature": 22.0}, device_id="2"))
+    scheduler.remove_rule("a")
+
+    assert len(scheduler._heap) == 4
+    scheduler._run_due(scheduler._heap[0][0])
+
+    assert broker.published == [("2/control", {"temperature": 22.0})]
+    assert sorted(entry[3].rule_id for entry in scheduler._heap) == ["b", "c"]
+    assert scheduler._dead == 0
+
+
+def test_failing_device_does_not_stop_batch(make_device, broker, caplog):
+    devices = [make_device("1"), make_device("2")]
+    home = Home("h", devices)
+
+    def fail(**_):
+        raise RuntimeError("publish failed")
+
+    devices[0].set_state = fail
+    scheduler = Scheduler(home)
+    scheduler.add_rule(ScheduleRule("r", time_of_day(9), {"temperature": 24.0}, area_name="Hall"))
+
+    with caplog.at_level(logging.ERROR):
+        due_all(scheduler)
+
+    assert broker.published == [("2/control", {"temperature": 24.0})]
+    assert "publish failed" in caplog.text
+    assert len(scheduler._heap) == 1
+
+
+def test_run_fires_due_rules(make_device, broker):
+    home = Home("h", [make_device("1")])
+
+    async def run():
+        scheduler = Scheduler(home)
+        scheduler.start()
+        scheduler.add_rule(ScheduleRule("r", time_of_day(9), {"temperature": 24.0}, device_id="1"))
+        scheduler._heap[0] = (time.time() + 0.05,) + scheduler._heap[0][1:]
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+
+    asyncio.run(run())
+    assert broker.published == [("1/control", {"temperature": 24.0})]
+
+
+def test_save_and_load_round_trip(make_device, tmp_path):
+    home = Home("h", [make_device("1")])
+    scheduler = Scheduler(home)
+    scheduler.add_rule(ScheduleRule("a", time_of_day(9, 15), {
+        "power_mode": PowerMode.ON, "hvac_mode": HVACMode.COOL, "temperature": 24.5
+    }, device_id="1", weekdays=(0, 2, 4)))
+    scheduler.add_rule(ScheduleRule("b", time_of_day(18), {"power_mode": PowerMode.OFF},
+                                    area_name="Hall"))
+    path = tmp_path / "rules.json"
+    scheduler.save(str(path))
+
+    loaded = Scheduler(home)
+    loaded.load(str(path))
+
+    assert [r.to_dict() for r in loaded.rules] == [r.to_dict() for r in scheduler.rules]
+    assert sorted(entry[0] for entry in loaded._heap) == sorted(
+        entry[0] for entry in scheduler._heap
+    )
+
+
+def test_dead_entries_are_compacted(make_device):
+    home = Home("h", [make_device("1")])
+    scheduler = Scheduler(home)
+    for rule_id in ("a", "b"):
+        scheduler.add_rule(ScheduleRule(rule_id, time_of_day(9), {"temperature": 20.0}, device_id="1"))
+
+    for temperature in range(100):
+        scheduler.add_rule(ScheduleRule("a", time_of_day(9), {"temperature": temperature}, device_id="1"))
+
+    assert len(scheduler._heap) <= 2 * len(scheduler.rules) + 1
+    assert sorted(entry[3].rule_id for entry in scheduler._heap
+                  if scheduler._order[entry[3].rule_id] == entry[2]) == ["a", "b"]
+
+
+def test_bad_file_leaves_schedule_untouched(make_device, tmp_path):
+    home = Home("h", [make_device("1")])
+    scheduler = Scheduler(home)
+    scheduler.add_rule(ScheduleRule("a", time_of_day(9), {"temperature": 20.0}, device_id="1"))
+    heap = list(scheduler._heap)
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"rules": [
+        {"rule_id": "b", "at": "10:00:00", "device_id": "1", "actions": {"temperature": 21.0}},
+        {"rule_id": "c", "at": "11:00:00", "device_id": "1", "actions": {"power_mode": "bogus"}},
+    ]}))
+
+    with pytest.raises(ValueError):
+        scheduler.load(str(path))
+
+    assert [r.rule_id for r in scheduler.rules] == ["a"]
+    assert scheduler._heap == heap
+
+
+def test_failed_save_keeps_previous_file(make_device, tmp_path, monkeypatch):
+    home = Home("h", [make_device("1")])
+    scheduler = Scheduler(home)
+    scheduler.add_rule(ScheduleRule("a", time_of_day(9), {"temperature": 20.0}, device_id="1"))
+    path = tmp_path / "rules.json"
+    scheduler.save(str(path))
+    saved = path.read_text()
+
+    def fail(*_, **__):
+        raise OSError("disk full")
+
+    scheduler.add_rule(ScheduleRule("b", time_of_day(9), {"temperature": 21.0}, device_id="1"))
+    monkeypatch.setattr(json, "dump", fail)
+    with pytest.raises(OSError):
+        scheduler.save(str(path))
+
+    assert path.read_text() == saved
+    assert [p.name for p in tmp_path.iterdir()] == ["rules.json"]